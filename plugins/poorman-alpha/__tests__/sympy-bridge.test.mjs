@@ -0,0 +1,97 @@
+/**
+ * Tests for the advanced (nerdamer) bridge: step breakdowns, the function
+ * table plot substitute, and the per-expression cache.
+ */
+
+import { callSympy, getCacheStats } from '../sympy-bridge.mjs';
+
+const OPTIONS = { steps: true, plot: true, cache: false };
+
+describe('callSympy steps', () => {
+  it('picks the step handler from the leading function name', async () => {
+    const response = await callSympy('diff(x^3, x)', OPTIONS);
+    expect(response.steps).toEqual([
+      'Step 1: Identify function to differentiate from: diff(x^3, x)',
+      'Step 2: Apply differentiation rules',
+      `Step 3: Derivative: ${response.result}`,
+    ]);
+  });
+
+  it('shows the inner argument of a transform, keeping nested calls intact', async () => {
+    const response = await callSympy('expand(factor(x^2-1))', OPTIONS);
+    expect(response.steps).toHaveLength(3);
+    expect(response.steps[0]).toBe('Step 1: Parse expression: factor(x^2-1)');
+    expect(response.steps[1].startsWith('Step 2: Original form: ')).toBe(true);
+    expect(response.steps[2]).toBe(`Step 3: Expanded form: ${response.result}`);
+  });
+
+  it('stops the inner argument at its matching bracket', async () => {
+    const response = await callSympy('expand((x+1)^2) + 1', OPTIONS);
+    expect(response.steps[0]).toBe('Step 1: Parse expression: (x+1)^2');
+    expect(response.steps[2]).toBe(`Step 3: Expanded form: ${response.result}`);
+  });
+
+  it('falls back to the generic breakdown for other expressions', async () => {
+    const response = await callSympy('x^2 + 2', OPTIONS);
+    expect(response.steps).toEqual([
+      'Step 1: Evaluate expression: x^2 + 2',
+      `Step 2: Result: ${response.result}`,
+    ]);
+  });
+});
+
+describe('callSympy routing', () => {
+  it('converts explicit unit conversions with mathjs', async () => {
+    const response = await callSympy('5 km to m', { cache: false });
+    expect(response.engine).toBe('mathjs');
+    expect(response.result).toBe('5000 m');
+  });
+
+  it('keeps single-letter unit names symbolic', async () => {
+    const response = await callSympy('m + g', { cache: false });
+    expect(response.engine).toBe('nerdamer-advanced');
+    expect(response.result).toBe('g+m');
+  });
+});
+
+describe('callSympy function table', () => {
+  it('evaluates every sample point', async () => {
+    const response = await callSympy('x^2', OPTIONS);
+    expect(response.plot.type).toBe('function_table');
+    expect(response.plot.points).toEqual([
+      { x: -10, y: 100 }, { x: -5, y: 25 }, { x: -2, y: 4 }, { x: -1, y: 1 },
+      { x: -0.5, y: 0.25 }, { x: 0, y: 0 }, { x: 0.5, y: 0.25 }, { x: 1, y: 1 },
+      { x: 2, y: 4 }, { x: 5, y: 25 }, { x: 10, y: 100 },
+    ]);
+  });
+
+  it('folds constant subexpressions without changing the values', async () => {
+    const response = await callSympy('sqrt(4) * 2 * pi * x', OPTIONS);
+    const at = (x) => response.plot.points.find((p) => p.x === x).y;
+    expect(at(1)).toBe(12.5664);
+    expect(at(-0.5)).toBe(-6.2832);
+    expect(at(0)).toBe(0);
+  });
+
+  it('skips points that are not finite', async () => {
+    const response = await callSympy('1/x', OPTIONS);
+    const xs = response.plot.points.map((p) => p.x);
+    expect(xs).toHaveLength(10);
+    expect(xs).not.toContain(0);
+  });
+});
+
+describe('callSympy expression cache', () => {
+  it('stores an entry for an expression that evaluates', async () => {
+    const before = getCacheStats().expressions.size;
+    await callSympy('x^3 + 7', { cache: false });
+    expect(getCacheStats().expressions.size).toBe(before + 1);
+  });
+
+  it('does not store an entry for an expression that fails to parse', async () => {
+    const before = getCacheStats().expressions.size;
+    const response = await callSympy('x + )', { cache: false });
+    expect(response.errorCode).toBe('COMPUTATION_ERROR');
+    expect(getCacheStats().expressions.size).toBe(before);
+  });
+});
@@ -1,4 +1,4 @@
-import { computeAsync, computationalTool, getCacheStats, clearCache } from './native.mjs';
+import { computeAsync, computationalTool, getCacheStats, clearCache, preloadWorker, shutdown as shutdownNative } from './native.mjs';
 import { callSympy, shutdown as shutdownAdvanced, getCacheStats as getAdvancedCacheStats } from './sympy-bridge.mjs';
 import { registerSettingsHandlers } from '../../src/plugins/plugin-settings-handlers.mjs';
 import { consoleStyler } from '../../src/ui/console-styler.mjs';
@@ -8,6 +8,7 @@ const DEFAULT_SETTINGS = {
   nerdamerTimeout: 10000,
   cacheEnabled: true,
   defaultFormat: 'text',
+  preloadEngine: false,
 };
 
 const SETTINGS_SCHEMA = [
@@ -48,6 +49,13 @@ const SETTINGS_SCHEMA = [
       { value: 'all', label: 'All (Text + LaTeX)' },
     ],
   },
+  {
+    key: 'preloadEngine',
+    label: 'Preload Symbolic Engine',
+    type: 'boolean',
+    description: 'Start the nerdamer worker when the plugin activates so the first computation does not pay its startup cost. Applies at the next activation; turning it off does not stop a running worker.',
+    default: false,
+  },
 ];
 
 // NOTE: Plugin state is stored on `api.setInstance()/getInstance()` rather than in a module-level
@@ -72,6 +80,10 @@ export async function activate(api) {
 
   instanceState.settings = pluginSettings;
 
+  if (pluginSettings.preloadEngine) {
+    preloadWorker();
+  }
+
   const computeTool = {
     name: 'compute',
     description:
@@ -222,6 +234,7 @@ export async function activate(api) {
 export function deactivate(api) {
   consoleStyler.log('plugin', `Deactivating...`);
   shutdownAdvanced();
+  shutdownNative();
   clearCache();
   api.setInstance(null);
   consoleStyler.log('plugin', `Deactivated`);
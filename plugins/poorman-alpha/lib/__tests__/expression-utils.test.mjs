@@ -0,0 +1,33 @@
+/**
+ * Tests for expression string helpers.
+ */
+
+import { extractCallArgument } from '../expression-utils.mjs';
+
+describe('extractCallArgument', () => {
+  it('returns the argument of a simple call', () => {
+    expect(extractCallArgument('simplify(x/x)')).toBe('x/x');
+  });
+
+  it('keeps nested calls intact', () => {
+    expect(extractCallArgument('expand(factor(x^2-1))')).toBe('factor(x^2-1)');
+  });
+
+  it('stops at the matching bracket when a term follows the call', () => {
+    expect(extractCallArgument('expand((x+1)^2) + 1')).toBe('(x+1)^2');
+  });
+
+  it('stops at a top-level comma but not at nested ones', () => {
+    expect(extractCallArgument('factor(x^2, x)')).toBe('x^2');
+    expect(extractCallArgument('expand(f(x, y), z)')).toBe('f(x, y)');
+    expect(extractCallArgument('simplify([1, 2])')).toBe('[1, 2]');
+  });
+
+  it('returns null for unbalanced brackets', () => {
+    expect(extractCallArgument('expand((x+1)')).toBeNull();
+  });
+
+  it('returns null when there is no call', () => {
+    expect(extractCallArgument('x + 1')).toBeNull();
+  });
+});
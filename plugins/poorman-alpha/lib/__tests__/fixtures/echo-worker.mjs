@@ -0,0 +1,27 @@
+/**
+ * Test worker for SerialWorker. Replies with the expression it was sent;
+ * a few special expressions simulate slow, stuck, crashing and misbehaving
+ * workers.
+ */
+
+import { parentPort } from 'worker_threads';
+
+function sleep(ms) {
+  Atomics.wait(new Int32Array(new SharedArrayBuffer(4)), 0, 0, ms);
+}
+
+parentPort.on('message', ({ id, expression }) => {
+  if (expression === 'hang') {
+    for (;;) { /* never replies */ }
+  }
+  if (expression === 'crash') {
+    throw new Error('worker crashed');
+  }
+  if (expression === 'stale') {
+    parentPort.postMessage({ id: -1, result: 'wrong' });
+  }
+  if (expression.startsWith('sleep:')) {
+    sleep(Number(expression.slice(6)));
+  }
+  parentPort.postMessage({ id, result: expression });
+});
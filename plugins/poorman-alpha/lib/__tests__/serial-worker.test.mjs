@@ -0,0 +1,79 @@
+/**
+ * Tests for the SerialWorker request queue used by the nerdamer worker.
+ */
+
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { SerialWorker } from '../serial-worker.mjs';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const ECHO_WORKER = path.join(__dirname, 'fixtures', 'echo-worker.mjs');
+
+let pool;
+
+beforeEach(() => {
+  pool = new SerialWorker(ECHO_WORKER);
+});
+
+afterEach(() => {
+  pool.shutdown();
+});
+
+describe('SerialWorker', () => {
+  it('resolves concurrent requests with their own replies', async () => {
+    const results = await Promise.all(
+      ['a', 'b', 'c'].map((expression) => pool.run({ expression }, 5000))
+    );
+    expect(results).toEqual([{ result: 'a' }, { result: 'b' }, { result: 'c' }]);
+  });
+
+  it('ignores replies that do not match the active request id', async () => {
+    await expect(pool.run({ expression: 'stale' }, 5000)).resolves.toEqual({ result: 'stale' });
+  });
+
+  it('times out a queued request within its own budget without disturbing the running one', async () => {
+    const started = Date.now();
+    const running = pool.run({ expression: 'sleep:400' }, 5000);
+    const queued = pool.run({ expression: 'after' }, 100);
+
+    await expect(queued).rejects.toThrow('TIMEOUT');
+    expect(Date.now() - started).toBeLessThan(400);
+    await expect(running).resolves.toEqual({ result: 'sleep:400' });
+  });
+
+  it('counts time spent queued against the timeout', async () => {
+    const first = pool.run({ expression: 'sleep:300' }, 500);
+    const second = pool.run({ expression: 'sleep:300' }, 500);
+
+    await expect(first).resolves.toEqual({ result: 'sleep:300' });
+    await expect(second).rejects.toThrow('TIMEOUT');
+  });
+
+  it('times out only the stuck request and continues the queue on a fresh worker', async () => {
+    const stuck = pool.run({ expression: 'hang' }, 200);
+    const queued = pool.run({ expression: 'after' }, 2000);
+
+    await expect(stuck).rejects.toThrow('TIMEOUT');
+    await expect(queued).resolves.toEqual({ result: 'after' });
+  });
+
+  it('rejects only the request that crashed the worker', async () => {
+    const crashed = pool.run({ expression: 'crash' }, 2000);
+    const queued = pool.run({ expression: 'after' }, 2000);
+
+    await expect(crashed).rejects.toThrow('worker crashed');
+    await expect(queued).resolves.toEqual({ result: 'after' });
+  });
+
+  it('shutdown() rejects active and queued requests and allows a restart', async () => {
+    const active = pool.run({ expression: 'hang' }, 5000);
+    const queued = pool.run({ expression: 'after' }, 5000);
+    pool.shutdown();
+
+    await expect(active).rejects.toThrow('WORKER_SHUTDOWN');
+    await expect(queued).rejects.toThrow('WORKER_SHUTDOWN');
+    expect(pool.worker).toBeNull();
+
+    await expect(pool.run({ expression: 'again' }, 5000)).resolves.toEqual({ result: 'again' });
+  });
+});
@@ -0,0 +1,29 @@
+/**
+ * expression-utils.js — String helpers for inspecting math expressions.
+ */
+
+/**
+ * Extract the first argument of the leading function call, matching brackets
+ * so that nested calls (`expand(factor(x^2-1))`) and trailing terms
+ * (`expand((x+1)^2) + 1`) are handled. Returns null if brackets are unbalanced.
+ */
+function extractCallArgument(expression) {
+  const open = expression.indexOf('(');
+  if (open === -1) return null;
+
+  let depth = 0;
+  for (let i = open; i < expression.length; i++) {
+    const ch = expression[i];
+    if (ch === '(' || ch === '[') {
+      depth++;
+    } else if (ch === ')' || ch === ']') {
+      depth--;
+      if (depth === 0) return expression.slice(open + 1, i).trim();
+    } else if (ch === ',' && depth === 1) {
+      return expression.slice(open + 1, i).trim();
+    }
+  }
+  return null;
+}
+
+export { extractCallArgument };
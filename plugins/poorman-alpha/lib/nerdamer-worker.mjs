@@ -4,10 +4,10 @@ import 'nerdamer/Algebra.js';
 import 'nerdamer/Calculus.js';
 import 'nerdamer/Solve.js';
 
-parentPort.on('message', ({ expression, format }) => {
+parentPort.on('message', ({ id, expression, format }) => {
   try {
     const result = nerdamer(expression);
-    const response = { result: result.toString() };
+    const response = { id, result: result.toString() };
 
     if (format === 'latex' || format === 'all') {
       try {
@@ -19,6 +19,6 @@ parentPort.on('message', ({ expression, format }) => {
 
     parentPort.postMessage(response);
   } catch (err) {
-    parentPort.postMessage({ error: err.message || String(err) });
+    parentPort.postMessage({ id, error: err.message || String(err) });
   }
 });
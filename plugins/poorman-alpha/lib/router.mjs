@@ -14,6 +14,12 @@ const NERDAMER_FUNCTIONS = new Set([
   'determinant', 'size', 'dot', 'cross',
 ]);
 
+// Call-site patterns for NERDAMER_FUNCTIONS, compiled once at module load
+const NERDAMER_FUNCTION_PATTERNS = Array.from(
+  NERDAMER_FUNCTIONS,
+  (func) => [func, new RegExp(`\\b${func}\\s*\\(`, 'i')]
+);
+
 // Mathjs unit names (most common)
 const MATHJS_UNITS = new Set([
   // Length
@@ -91,8 +97,7 @@ function classifyExpression(expression) {
   }
 
   // Signal 4: Contains nerdamer function calls
-  for (const func of NERDAMER_FUNCTIONS) {
-    const re = new RegExp(`\\b${func}\\s*\\(`, 'i');
+  for (const [func, re] of NERDAMER_FUNCTION_PATTERNS) {
     if (re.test(expression)) {
       symbolicScore += 5;
       signals.push(`nerdamer_func:${func}`);
@@ -147,4 +152,4 @@ function classifyExpression(expression) {
   return { route, confidence, signals };
 }
 
-export { classifyExpression, NERDAMER_FUNCTIONS, MATHJS_UNITS };
+export { classifyExpression, NERDAMER_FUNCTIONS, MATHJS_UNITS, UNIT_CONVERSION_RE };
@@ -0,0 +1,137 @@
+/**
+ * serial-worker.js — Long-lived worker thread with a FIFO request queue.
+ *
+ * Requests are posted to the worker one at a time. Each request's timeout
+ * covers its whole wait, queued and running: a request whose deadline passes
+ * in the queue is rejected without touching the worker, and one whose
+ * deadline passes while running is the only one that fails — the stuck worker
+ * is terminated and the queue continues on a fresh worker.
+ */
+
+import { Worker } from 'worker_threads';
+
+class SerialWorker {
+  /**
+   * @param {string|URL} workerPath - Worker script. It must reply to each
+   *   `{ id, ...message }` with a message carrying the same `id`.
+   */
+  constructor(workerPath) {
+    this.workerPath = workerPath;
+    this.worker = null;
+    this.queue = [];
+    this.active = null;
+    this.nextId = 0;
+  }
+
+  /**
+   * Queue a message for the worker.
+   * @param {object} message
+   * @param {number} timeout - Milliseconds allowed from the call, including
+   *   time spent queued behind other requests
+   * @returns {Promise<object>} The worker's reply (without its `id`). Rejects
+   *   with `TIMEOUT`, `WORKER_SHUTDOWN`, or the worker's error if it crashed
+   *   while running this request.
+   */
+  run(message, timeout) {
+    return new Promise((resolve, reject) => {
+      const request = { id: ++this.nextId, message, resolve, reject, timer: null };
+      request.timer = setTimeout(() => this._onTimeout(request), timeout);
+      this.queue.push(request);
+      this._next();
+    });
+  }
+
+  /**
+   * Start the worker ahead of the first request.
+   */
+  start() {
+    this._getWorker();
+  }
+
+  /**
+   * Terminate the worker and reject every active and queued request with
+   * `WORKER_SHUTDOWN`. A later run() starts a new worker.
+   */
+  shutdown() {
+    const pending = this.active ? [this.active, ...this.queue] : this.queue;
+    this.active = null;
+    this.queue = [];
+    this._discardWorker();
+
+    const err = new Error('WORKER_SHUTDOWN');
+    for (const request of pending) {
+      clearTimeout(request.timer);
+      request.reject(err);
+    }
+  }
+
+  _getWorker() {
+    if (this.worker) return this.worker;
+
+    const worker = new Worker(this.workerPath);
+    worker.on('message', (msg) => this._onMessage(worker, msg));
+    worker.on('error', (err) => this._onFailure(worker, err));
+    worker.on('exit', () => this._onFailure(worker, new Error('WORKER_EXIT')));
+
+    // Don't keep the process alive just for an idle worker
+    worker.unref();
+    this.worker = worker;
+    return worker;
+  }
+
+  _discardWorker() {
+    const worker = this.worker;
+    this.worker = null;
+    if (worker) worker.terminate();
+  }
+
+  _next() {
+    if (this.active || this.queue.length === 0) return;
+
+    const request = this.queue.shift();
+    this.active = request;
+    this._getWorker().postMessage({ id: request.id, ...request.message });
+  }
+
+  _finishActive() {
+    const request = this.active;
+    this.active = null;
+    if (request) clearTimeout(request.timer);
+    return request;
+  }
+
+  _onMessage(worker, { id, ...msg }) {
+    if (worker !== this.worker || !this.active || this.active.id !== id) return;
+    this._finishActive().resolve(msg);
+    this._next();
+  }
+
+  _onTimeout(request) {
+    if (this.active !== request) {
+      // Still queued — drop it; the worker is busy with someone else
+      const index = this.queue.indexOf(request);
+      if (index !== -1) {
+        this.queue.splice(index, 1);
+        request.reject(new Error('TIMEOUT'));
+      }
+      return;
+    }
+    this._finishActive();
+    // The worker is stuck on this request and can only be interrupted by
+    // terminating it; queued requests continue on a fresh worker.
+    this._discardWorker();
+    request.reject(new Error('TIMEOUT'));
+    this._next();
+  }
+
+  _onFailure(worker, err) {
+    // Ignore exits of workers we already discarded
+    if (worker !== this.worker) return;
+    this._discardWorker();
+    const request = this._finishActive();
+    if (request) request.reject(err);
+    this._next();
+  }
+}
+
+export { SerialWorker };
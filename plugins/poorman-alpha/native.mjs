@@ -11,6 +11,7 @@ import { ErrorCode, makeError, makeResult } from './lib/errors.mjs';
 import { sanitizeJS } from './lib/sanitizer.mjs';
 import { classifyExpression } from './lib/router.mjs';
 import { LRUCache } from './lib/cache.mjs';
+import { SerialWorker } from './lib/serial-worker.mjs';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -39,17 +40,19 @@ function tryMathjs(expression, format) {
   return response;
 }
 
+// Built once at module load rather than per call — tryMatrix() runs on every
+// compute request, including the ones that are not matrix expressions.
+const MATRIX_OPS = Object.entries({
+  det: /^det\((.+)\)$/i,
+  inv: /^inv\((.+)\)$/i,
+  transpose: /^transpose\((.+)\)$/i,
+  eigenvalues: /^eigenvalues\((.+)\)$/i,
+  rank: /^rank\((.+)\)$/i,
+  size: /^size\((.+)\)$/i,
+});
+
 function tryMatrix(expression) {
-  const matOps = {
-    det: /^det\((.+)\)$/i,
-    inv: /^inv\((.+)\)$/i,
-    transpose: /^transpose\((.+)\)$/i,
-    eigenvalues: /^eigenvalues\((.+)\)$/i,
-    rank: /^rank\((.+)\)$/i,
-    size: /^size\((.+)\)$/i,
-  };
-
-  for (const [op, re] of Object.entries(matOps)) {
+  for (const [op, re] of MATRIX_OPS) {
     const match = expression.match(re);
     if (match) {
       try {
@@ -147,36 +150,20 @@ function computationalTool(input, options = {}) {
   return result;
 }
 
-function runNerdamerWorker(expression, format, timeout) {
-  return new Promise((resolve, reject) => {
-    const workerPath = path.join(__dirname, 'lib', 'nerdamer-worker.mjs');
-    const worker = new Worker(workerPath);
-
-    const timer = setTimeout(() => {
-      worker.terminate();
-      reject(new Error('TIMEOUT'));
-    }, timeout);
-
-    worker.on('message', (msg) => {
-      clearTimeout(timer);
-      worker.terminate();
-      if (msg.error) {
-        resolve(makeError(ErrorCode.COMPUTATION_ERROR, msg.error, 'nerdamer'));
-      } else {
-        const result = makeResult(msg.result, 'nerdamer');
-        if (msg.latex) result.latex = msg.latex;
-        resolve(result);
-      }
-    });
-
-    worker.on('error', (err) => {
-      clearTimeout(timer);
-      worker.terminate();
-      reject(err);
-    });
+// Long-lived nerdamer worker. Spawning a Worker per request re-imports
+// nerdamer and its Algebra/Calculus/Solve modules every time, which costs far
+// more than the computation itself. SerialWorker keeps one resident, runs
+// requests one at a time and only replaces it when a computation times out.
+const nerdamerWorker = new SerialWorker(path.join(__dirname, 'lib', 'nerdamer-worker.mjs'));
 
-    worker.postMessage({ expression, format });
-  });
+async function runNerdamerWorker(expression, format, timeout) {
+  const msg = await nerdamerWorker.run({ expression, format }, timeout);
+  if (msg.error) {
+    return makeError(ErrorCode.COMPUTATION_ERROR, msg.error, 'nerdamer');
+  }
+  const result = makeResult(msg.result, 'nerdamer');
+  if (msg.latex) result.latex = msg.latex;
+  return result;
 }
 
 async function computeAsync(input, options = {}) {
@@ -219,6 +206,9 @@ async function computeAsync(input, options = {}) {
       if (err.message === 'TIMEOUT') {
         return makeError(ErrorCode.TIMEOUT, `Nerdamer timed out after ${timeout}ms`, 'nerdamer');
       }
+      if (err.message === 'WORKER_SHUTDOWN') {
+        return makeError(ErrorCode.WORKER_ERROR, 'Nerdamer worker was shut down', 'nerdamer');
+      }
     }
   }
 
@@ -234,4 +224,12 @@ function clearCache() {
   cache.clear();
 }
 
-export { computationalTool, computeAsync, getCacheStats, clearCache };
+function preloadWorker() {
+  if (Worker) nerdamerWorker.start();
+}
+
+function shutdown() {
+  nerdamerWorker.shutdown();
+}
+
+export { computationalTool, computeAsync, getCacheStats, clearCache, preloadWorker, shutdown };
@@ -16,6 +16,8 @@ import * as math from 'mathjs';
 
 import { ErrorCode, makeError, makeResult } from './lib/errors.mjs';
 import { sanitizeJS } from './lib/sanitizer.mjs';
+import { UNIT_CONVERSION_RE } from './lib/router.mjs';
+import { extractCallArgument } from './lib/expression-utils.mjs';
 import { LRUCache } from './lib/cache.mjs';
 
 const DEFAULT_TIMEOUT_MS = 30000;
@@ -23,6 +25,15 @@ const DEFAULT_TIMEOUT_MS = 30000;
 // Cache instance for advanced math results
 const advancedCache = new LRUCache(128);
 
+// Per-expression artifacts keyed by normalized input, each slot filled lazily
+// by its consumer: `parsed` (nerdamer result, shared by the main result and the
+// steps breakdown) and `compiled` (mathjs evaluator for the function table).
+// Unlike advancedCache this is shared across formats, steps and plot requests.
+const expressionCache = new LRUCache(512);
+
+// Sample points for the function table, shared by every request
+const TABLE_X_VALUES = Object.freeze([-10, -5, -2, -1, -0.5, 0, 0.5, 1, 2, 5, 10]);
+
 /**
  * Map SymPy-style expression syntax to nerdamer-compatible syntax.
  * This handles common expressions that users might write in SymPy notation.
@@ -43,12 +54,38 @@ function normalizeExpression(expression) {
   return expr;
 }
 
+/**
+ * Return one slot of the expressionCache entry for a normalized expression,
+ * computing it with `build` if missing. Nothing is cached until `build`
+ * succeeds, so expressions that throw never evict useful entries.
+ */
+function getCachedSlot(normalized, slot, build) {
+  const entry = expressionCache.get(normalized);
+  if (entry && entry[slot] !== undefined) return entry[slot];
+
+  const value = build();
+  if (entry) {
+    entry[slot] = value;
+  } else {
+    expressionCache.set(normalized, { [slot]: value });
+  }
+  return value;
+}
+
+/**
+ * Parse and evaluate an expression with nerdamer, memoized on the normalized
+ * expression string.
+ */
+function parseNerdamer(expression) {
+  const normalized = normalizeExpression(expression);
+  return getCachedSlot(normalized, 'parsed', () => nerdamer(normalized));
+}
+
 /**
  * Attempt to evaluate using nerdamer's symbolic engine.
  */
 function evaluateNerdamer(expression, format = 'text') {
-  const normalized = normalizeExpression(expression);
-  const result = nerdamer(normalized);
+  const result = parseNerdamer(expression);
   const response = { result: result.toString() };
 
   if (format === 'latex' || format === 'all') {
@@ -62,55 +99,60 @@ function evaluateNerdamer(expression, format = 'text') {
   return response;
 }
 
+/**
+ * Steps for operations whose inner argument is shown in its original form
+ * before the transformed result.
+ */
+function transformSteps(label) {
+  return (steps, expression, result) => {
+    const inner = extractCallArgument(expression) ?? expression;
+    steps.push(`Step 1: Parse expression: ${inner}`);
+    const original = parseNerdamer(inner);
+    steps.push(`Step 2: Original form: ${original.toString()}`);
+    steps.push(`Step 3: ${label}: ${result}`);
+  };
+}
+
+// Step generators keyed by the leading function name of the expression.
+const STEP_HANDLERS = new Map([
+  ['integrate', (steps, expression, result) => {
+    steps.push(`Step 1: Identify the integrand from: ${expression}`);
+    steps.push(`Step 2: Apply integration rules`);
+    steps.push(`Step 3: Result: ${result}`);
+  }],
+  ['diff', (steps, expression, result) => {
+    steps.push(`Step 1: Identify function to differentiate from: ${expression}`);
+    steps.push(`Step 2: Apply differentiation rules`);
+    steps.push(`Step 3: Derivative: ${result}`);
+  }],
+  ['solve', (steps, expression, result) => {
+    steps.push(`Step 1: Parse equation from: ${expression}`);
+    steps.push(`Step 2: Apply algebraic solving techniques`);
+    steps.push(`Step 3: Solutions: ${result}`);
+  }],
+  ['expand', transformSteps('Expanded form')],
+  ['factor', transformSteps('Factored form')],
+  ['simplify', transformSteps('Simplified form')],
+]);
+
+function genericSteps(steps, expression, result) {
+  steps.push(`Step 1: Evaluate expression: ${expression}`);
+  steps.push(`Step 2: Result: ${result}`);
+}
+
 /**
  * Generate step-by-step solution breakdown.
+ * @param {string} expression
+ * @param {string} result - Already-computed result for the full expression
  */
-function generateSteps(expression) {
+function generateSteps(expression, result) {
   const steps = [];
   const exprLower = expression.toLowerCase().trim();
+  const paren = exprLower.indexOf('(');
+  const handler = (paren > 0 && STEP_HANDLERS.get(exprLower.slice(0, paren))) || genericSteps;
 
   try {
-    if (exprLower.startsWith('integrate(') || exprLower.startsWith('integrate(')) {
-      steps.push(`Step 1: Identify the integrand from: ${expression}`);
-      const result = nerdamer(normalizeExpression(expression));
-      steps.push(`Step 2: Apply integration rules`);
-      steps.push(`Step 3: Result: ${result.toString()}`);
-    } else if (exprLower.startsWith('diff(')) {
-      steps.push(`Step 1: Identify function to differentiate from: ${expression}`);
-      const result = nerdamer(normalizeExpression(expression));
-      steps.push(`Step 2: Apply differentiation rules`);
-      steps.push(`Step 3: Derivative: ${result.toString()}`);
-    } else if (exprLower.startsWith('solve(')) {
-      steps.push(`Step 1: Parse equation from: ${expression}`);
-      const result = nerdamer(normalizeExpression(expression));
-      steps.push(`Step 2: Apply algebraic solving techniques`);
-      steps.push(`Step 3: Solutions: ${result.toString()}`);
-    } else if (exprLower.startsWith('expand(')) {
-      const inner = expression.slice(7, -1);
-      steps.push(`Step 1: Parse expression: ${inner}`);
-      const original = nerdamer(normalizeExpression(inner));
-      steps.push(`Step 2: Original form: ${original.toString()}`);
-      const result = nerdamer(normalizeExpression(expression));
-      steps.push(`Step 3: Expanded form: ${result.toString()}`);
-    } else if (exprLower.startsWith('factor(')) {
-      const inner = expression.slice(7, -1);
-      steps.push(`Step 1: Parse expression: ${inner}`);
-      const original = nerdamer(normalizeExpression(inner));
-      steps.push(`Step 2: Original form: ${original.toString()}`);
-      const result = nerdamer(normalizeExpression(expression));
-      steps.push(`Step 3: Factored form: ${result.toString()}`);
-    } else if (exprLower.startsWith('simplify(')) {
-      const inner = expression.slice(9, -1);
-      steps.push(`Step 1: Parse expression: ${inner}`);
-      const original = nerdamer(normalizeExpression(inner));
-      steps.push(`Step 2: Original form: ${original.toString()}`);
-      const result = nerdamer(normalizeExpression(expression));
-      steps.push(`Step 3: Simplified form: ${result.toString()}`);
-    } else {
-      steps.push(`Step 1: Evaluate expression: ${expression}`);
-      const result = nerdamer(normalizeExpression(expression));
-      steps.push(`Step 2: Result: ${result.toString()}`);
-    }
+    handler(steps, expression, result);
   } catch (e) {
     steps.push(`Error generating steps: ${e.message}`);
   }
@@ -118,6 +160,22 @@ function generateSteps(expression) {
   return steps;
 }
 
+/**
+ * Compile a normalized expression to a mathjs evaluator once and reuse it
+ * for every sample point (and every later table of the same expression).
+ * Constant subtrees are folded first so they are not recomputed per point.
+ */
+function compileNumeric(normalized) {
+  return getCachedSlot(normalized, 'compiled', () => {
+    const node = math.parse(normalized);
+    try {
+      return math.simplifyConstant(node, { exactFractions: false }).compile();
+    } catch (_e) {
+      return node.compile();
+    }
+  });
+}
+
 /**
  * Generate a text-based function table as a plot substitute.
  * Since we no longer have matplotlib, we provide numeric samples.
@@ -125,15 +183,16 @@ function generateSteps(expression) {
 function generateFunctionTable(expression) {
   try {
     const normalized = normalizeExpression(expression);
-    // Try to evaluate at sample points using mathjs
+    const compiled = compileNumeric(normalized);
+    // Evaluate at sample points using the compiled mathjs expression. One Map
+    // scope is reused for every point; mathjs uses a Map as-is instead of
+    // wrapping a fresh object scope on each evaluate() call.
+    const scope = new Map();
     const points = [];
-    const xValues = [-10, -5, -2, -1, -0.5, 0, 0.5, 1, 2, 5, 10];
-
-    for (const x of xValues) {
+    for (const x of TABLE_X_VALUES) {
       try {
-        // Replace 'x' with the numeric value
-        const withValue = normalized.replace(/\bx\b/g, `(${x})`);
-        const y = math.evaluate(withValue);
+        scope.set('x', x);
+        const y = compiled.evaluate(scope);
         if (typeof y === 'number' && isFinite(y)) {
           points.push({ x, y: Math.round(y * 10000) / 10000 });
         }
@@ -188,38 +247,45 @@ async function callSympy(expression, options = {}) {
     if (cached) return { ...cached, cached: true };
   }
 
-  // Execute with timeout
   let result;
-  try {
-    result = await Promise.race([
-      Promise.resolve().then(() => evaluateNerdamer(cleanExpr, format)),
-      new Promise((_, reject) =>
-        setTimeout(() => reject(new Error(`Computation timed out after ${timeout}ms`)), timeout)
-      ),
-    ]);
-  } catch (err) {
-    if (err.message.includes('timed out')) {
-      return makeError(ErrorCode.TIMEOUT, err.message, 'nerdamer-advanced');
+  let engine = 'nerdamer-advanced';
+
+  // Explicit conversions ("5 km to m") are outside nerdamer's domain — try
+  // mathjs first. Only the strict pattern is used: bare letters such as
+  // `m + g` are symbols here, not metres and grams.
+  if (UNIT_CONVERSION_RE.test(cleanExpr)) {
+    try {
+      result = { result: String(math.evaluate(cleanExpr)) };
+      engine = 'mathjs';
+    } catch (_e) {
+      // Fall through to nerdamer
     }
-    // Try mathjs as fallback
+  }
+
+  // Execute with timeout
+  if (!result) {
     try {
-      const mathjsResult = math.evaluate(normalizeExpression(cleanExpr).replace(/\^/g, '**'));
-      result = { result: String(mathjsResult) };
-      if (format === 'latex' || format === 'all') {
-        result.latex = null;
+      result = await Promise.race([
+        Promise.resolve().then(() => evaluateNerdamer(cleanExpr, format)),
+        new Promise((_, reject) =>
+          setTimeout(() => reject(new Error(`Computation timed out after ${timeout}ms`)), timeout)
+        ),
+      ]);
+    } catch (err) {
+      if (err.message.includes('timed out')) {
+        return makeError(ErrorCode.TIMEOUT, err.message, 'nerdamer-advanced');
       }
-    } catch (_e2) {
       return makeError(ErrorCode.COMPUTATION_ERROR, err.message, 'nerdamer-advanced');
     }
   }
 
-  const response = makeResult(result.result, 'nerdamer-advanced', {
+  const response = makeResult(result.result, engine, {
     latex: result.latex || null,
   });
 
   // Step-by-step breakdown
   if (steps) {
-    response.steps = generateSteps(cleanExpr);
+    response.steps = generateSteps(cleanExpr, response.result);
   }
 
   // Plot substitute (function table)
@@ -249,7 +315,7 @@ function shutdown() {
  * Get cache statistics.
  */
 function getCacheStats() {
-  return advancedCache.stats();
+  return { ...advancedCache.stats(), expressions: expressionCache.stats() };
 }
 
 export { callSympy, shutdown, getCacheStats };
@@ -17,6 +17,16 @@ async function loadPty() {
     return _pty;
 }
 
+// Flow control for PTY output.  When the WebSocket backlog grows past the
+// high-water mark the PTY is paused, and it is resumed from the send callback
+// once the backlog has drained below the low-water mark.
+const WS_HIGH_WATER_MARK = 1024 * 1024;
+const WS_LOW_WATER_MARK = 64 * 1024;
+
+// PTY output is coalesced into one WebSocket frame per event-loop turn; a
+// frame is sent early once this much output has accumulated.
+const WS_MAX_FRAME_CHARS = 64 * 1024;
+
 export class TerminalService {
     /**
      * Attach the terminal service to a WebSocket server.
@@ -78,14 +88,44 @@ function setupTerminalWebSocket(terminalWss, assistant) {
             }
 
             // PTY → Client
+            let ptyPaused = false;
+            const onSent = () => {
+                if (ptyPaused && ws.bufferedAmount < WS_LOW_WATER_MARK) {
+                    ptyPaused = false;
+                    ptyProcess.resume();
+                }
+            };
+            let pendingOutput = [];
+            let pendingChars = 0;
+            let flushScheduled = false;
+            const flushOutput = () => {
+                flushScheduled = false;
+                if (pendingOutput.length === 0) return;
+                const data = pendingOutput.length === 1 ? pendingOutput[0] : pendingOutput.join('');
+                pendingOutput = [];
+                pendingChars = 0;
+                if (ws.readyState !== 1) return;
+                ws.send(data, onSent);
+                if (!ptyPaused && ws.bufferedAmount > WS_HIGH_WATER_MARK) {
+                    ptyPaused = true;
+                    ptyProcess.pause();
+                }
+            };
             ptyProcess.onData((data) => {
-                if (ws.readyState === 1) {
-                    ws.send(data);
+                if (ws.readyState !== 1) return;
+                pendingOutput.push(data);
+                pendingChars += data.length;
+                if (pendingChars >= WS_MAX_FRAME_CHARS) {
+                    flushOutput();
+                } else if (!flushScheduled) {
+                    flushScheduled = true;
+                    setImmediate(flushOutput);
                 }
             });
 
             ptyProcess.onExit(({ exitCode, signal }) => {
                 consoleStyler.log('system', `Terminal PTY exited (code: ${exitCode}, signal: ${signal})`);
+                flushOutput();
                 if (ws.readyState === 1) {
                     ws.send(JSON.stringify({ type: 'exit', exitCode, signal }));
                     ws.close();
@@ -94,20 +134,21 @@ function setupTerminalWebSocket(terminalWss, assistant) {
 
             // Client → PTY
             ws.on('message', (message) => {
+                // Decode once; the same string is forwarded to the PTY below.
+                const str = message.toString();
                 try {
-                    // Try parsing as JSON for control messages
-                    if (typeof message === 'string' || (message instanceof Buffer && message[0] === 0x7b)) {
-                        const str = message.toString();
-                        if (str.startsWith('{')) {
-                            const parsed = JSON.parse(str);
-                            if (parsed.type === 'resize' && parsed.cols && parsed.rows) {
-                                try {
-                                    ptyProcess.resize(parseInt(parsed.cols, 10), parseInt(parsed.rows, 10));
-                                } catch (e) {
-                                    // ignore resize errors
-                                }
-                                return;
+                    // Try parsing as JSON for control messages.  Only frames
+                    // shaped like an object are parsed, so a typed '{' doesn't
+                    // go through JSON.parse and the exception path.
+                    if (str.length > 1 && str.charCodeAt(0) === 0x7b && str.charCodeAt(str.length - 1) === 0x7d) {
+                        const parsed = JSON.parse(str);
+                        if (parsed.type === 'resize' && parsed.cols && parsed.rows) {
+                            try {
+                                ptyProcess.resize(parseInt(parsed.cols, 10), parseInt(parsed.rows, 10));
+                            } catch (e) {
+                                // ignore resize errors
                             }
+                            return;
                         }
                     }
                 } catch {
@@ -115,7 +156,7 @@ function setupTerminalWebSocket(terminalWss, assistant) {
                 }
                 // Forward raw input to PTY
                 try {
-                    ptyProcess.write(message.toString());
+                    ptyProcess.write(str);
                 } catch (e) {
                     // ignore write errors
                 }
@@ -175,6 +216,15 @@ function setupDumbShell(ws, shellCommand, cwd) {
             if (ws.readyState === 1) ws.send(data.toString());
         });
 
+        // Writes after the shell has exited fail with EPIPE, which is thrown
+        // as an uncaught exception if stdin has no 'error' listener.  Once
+        // stdin has errored it is no longer writable and input is dropped.
+        shellProcess.stdin.on('error', (err) => {
+            if (err.code !== 'EPIPE') {
+                consoleStyler.log('error', `Dumb shell stdin error: ${err.message}`);
+            }
+        });
+
         shellProcess.on('exit', (code) => {
             if (ws.readyState === 1) {
                 ws.send(JSON.stringify({ type: 'exit', exitCode: code }));
@@ -184,20 +234,25 @@ function setupDumbShell(ws, shellCommand, cwd) {
         
         ws.on('message', (message) => {
             try {
-                const str = message.toString();
-                // Parse JSON control messages but forward everything else
-                if (str.startsWith('{')) {
-                    try {
-                        const parsed = JSON.parse(str);
-                        if (parsed.type === 'resize') {
-                            // Dumb shell doesn't support resize — ignore
-                            return;
+                // Parse JSON control messages but forward everything else.
+                // Only frames that start with '{' are decoded; shell input is
+                // written to stdin as the received Buffer, with no
+                // decode/re-encode round trip.
+                if (!Buffer.isBuffer(message) || message[0] === 0x7b) {
+                    const str = message.toString();
+                    if (str.startsWith('{')) {
+                        try {
+                            const parsed = JSON.parse(str);
+                            if (parsed.type === 'resize') {
+                                // Dumb shell doesn't support resize — ignore
+                                return;
+                            }
+                        } catch {
+                            // Not valid JSON — fall through to write as shell input
                         }
-                    } catch {
-                        // Not valid JSON — fall through to write as shell input
                     }
                 }
-                if (shellProcess.stdin) shellProcess.stdin.write(str);
+                if (shellProcess.stdin.writable) shellProcess.stdin.write(message);
             } catch (e) {}
         });
 